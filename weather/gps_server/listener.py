@@ -1,16 +1,29 @@
-# gps_server/listener.py (FIXED: Using Temporary File for Data Transfer)
+# gps_server/listener.py
 
 import http.server
 import socketserver
-import json
+import threading
 import tempfile
 import os
 from typing import Optional, Tuple
 
+# JSON helpers picked once at import: orjson if installed, else stdlib json
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
 # --- Configuration ---
 PORT = 8000
 ADDRESS = "127.0.0.1" 
 TEMP_FILE_PATH = os.path.join(tempfile.gettempdir(), "gps_coords_temp.json")
+WAIT_TIMEOUT = 120  # seconds to wait for the browser before giving up
+POLL_INTERVAL = 0.05  # serve loop's shutdown check; bounds how long shutdown() waits
 
 # --- HTML and JavaScript (Unchanged) ---
 HTML_PAGE = """
@@ -64,46 +77,71 @@ HTML_PAGE = """
 </body>
 </html>
 """
+# Encoded once at import instead of on every GET
+HTML_PAGE_BYTES = HTML_PAGE.encode("utf-8")
+HTML_LEN = str(len(HTML_PAGE_BYTES))
 
 # --- Custom TCPServer Class ---
-class ShutdownableTCPServer(socketserver.TCPServer):
-    def __init__(self, server_address, RequestHandlerClass, bind_and_activate=True):
+class ShutdownableTCPServer(socketserver.ThreadingTCPServer):
+    # Allow an immediate re-run without "Address already in use"
+    allow_reuse_address = True
+    # Browsers open parallel (and idle pre-opened) connections; don't let one block the others
+    daemon_threads = True
+
+    def __init__(self, server_address, RequestHandlerClass, bind_and_activate=True, persist=False,
+                 done=None):
         super().__init__(server_address, RequestHandlerClass, bind_and_activate)
         RequestHandlerClass.server = self 
-
-# --- Custom Handler Class (Writes to file) ---
+        # Coordinates handed back to get_gps_location() by the handler
+        self.coords = None
+        self.coords_lock = threading.Lock()
+        # Set by the handler once coordinates have arrived
+        self.done = done if done is not None else threading.Event()
+        # Also write the coordinates to TEMP_FILE_PATH for other processes
+        self.persist = persist
+
+# --- Custom Handler Class ---
 class GPSLocationHandler(http.server.SimpleHTTPRequestHandler):
     
     def do_GET(self):
         self.send_response(200)
         self.send_header("Content-type", "text/html")
+        self.send_header("Content-Length", HTML_LEN)
         self.end_headers()
-        self.wfile.write(HTML_PAGE.encode("utf-8"))
+        self.wfile.write(HTML_PAGE_BYTES)
 
     def do_POST(self):
         if self.path == '/location_data':
             try:
                 content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode('utf-8'))
+                # Read straight into a preallocated buffer and parse it without a decode step
+                post_data = bytearray(content_length)
+                n = self.rfile.readinto(post_data)
+                data = _loads(post_data if n == content_length else post_data[:n])
                 
                 latitude = data.get('latitude')
                 longitude = data.get('longitude')
 
                 if latitude is not None and longitude is not None:
-                    # FIX: 1. Write the coordinates to the temporary file
-                    coords = {'latitude': latitude, 'longitude': longitude}
-                    with open(TEMP_FILE_PATH, 'w') as f:
-                        json.dump(coords, f)
+                    # 1. Hand the coordinates back to the caller in-process
+                    with self.server.coords_lock:
+                        self.server.coords = (latitude, longitude)
+                        if self.server.persist:
+                            coords = {'latitude': latitude, 'longitude': longitude}
+                            # Write-then-rename so readers never see a half-written file
+                            tmp_path = TEMP_FILE_PATH + ".tmp"
+                            with open(tmp_path, 'wb') as f:
+                                f.write(_dumps(coords))
+                            os.replace(tmp_path, TEMP_FILE_PATH)
                     
-                    # 2. Shut down the server
-                    self.server.shutdown() 
-                    
-                    # 3. Send success response
+                    # 2. Send success response
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     self.end_headers()
-                    self.wfile.write(json.dumps({"status": "success"}).encode())
+                    self.wfile.write(_dumps({"status": "success"}))
+
+                    # 3. Signal the waiting caller, which shuts the server down
+                    self.server.done.set()
                     return
 
             except Exception:
@@ -114,48 +152,41 @@ class GPSLocationHandler(http.server.SimpleHTTPRequestHandler):
         self.send_response(404)
         self.end_headers()
 
-# --- Main Public Function (Reads from file) ---
-def get_gps_location() -> Optional[Tuple[float, float]]:
+# --- Main Public Function ---
+def get_gps_location(persist: bool = False,
+                     timeout: float = WAIT_TIMEOUT) -> Optional[Tuple[float, float]]:
     """
-    Starts the temporary web server, waits for coordinates, reads from a temp file, 
-    and cleans up.
-    Returns: (latitude, longitude) tuple or None if an error occurs.
+    Starts the temporary web server and waits up to timeout seconds for the browser
+    to post coordinates.
+    If persist is True, the coordinates are also written to TEMP_FILE_PATH.
+    Returns: (latitude, longitude) tuple or None if an error or timeout occurs.
     """
     print(f"Starting GPS listener on http://{ADDRESS}:{PORT}...")
-    print(f"Data will be temporarily stored at: {TEMP_FILE_PATH}")
+    if persist:
+        print(f"Data will be stored at: {TEMP_FILE_PATH}")
     print("1. Open your browser to the address above.")
     print("2. The browser will immediately ask for location permission.")
     print("The script will automatically shut down after receiving the data.")
     print("-" * 50)
-    
-    # 1. Clean up old file if it exists
-    if os.path.exists(TEMP_FILE_PATH):
-        os.remove(TEMP_FILE_PATH)
 
     httpd = None
+    done = threading.Event()
     try:
-        httpd = ShutdownableTCPServer((ADDRESS, PORT), GPSLocationHandler)
-        # Blocks execution until the server is shut down
-        httpd.serve_forever() 
-        
-        # 2. Execution resumes here after shutdown. Read the coordinates from the file.
-        if os.path.exists(TEMP_FILE_PATH):
-            with open(TEMP_FILE_PATH, 'r') as f:
-                coords = json.load(f)
-            
-            lat = coords.get('latitude')
-            lon = coords.get('longitude')
-            
-            # 3. Clean up the temporary file
-            os.remove(TEMP_FILE_PATH)
-            
-            if lat is not None and lon is not None:
-                return lat, lon
-            
+        httpd = ShutdownableTCPServer((ADDRESS, PORT), GPSLocationHandler, persist=persist, done=done)
+        # Serve in the background (one thread per connection, so an idle connection
+        # can't hold up the POST); this thread just waits for the signal or the deadline
+        threading.Thread(target=httpd.serve_forever, args=(POLL_INTERVAL,), daemon=True).start()
+        if not done.wait(timeout):
+            print("Timed out waiting for location data.")
+        httpd.shutdown()
+
+        with httpd.coords_lock:
+            return httpd.coords
+
     except Exception as e:
-        print(f"An error occurred during file operation or server run: {e}")
+        print(f"An error occurred during server run: {e}")
         return None
     finally:
         if httpd:
             # Ensure resources are cleaned up
-            httpd.server_close()
\ No newline at end of file
+            httpd.server_close()
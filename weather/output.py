@@ -4,14 +4,14 @@ Example module that imports fetch_weather_details from weather.py
 and uses it inside another Python program.
 """
 
-from weather import fetch_weather_details
-
-
 def get_weather_and_print(city: str):
     """
     A helper function that retrieves weather information
     and prints it in a formatted manner.
     """
+    # Imported here so the requests import chain is only paid when weather is fetched
+    from weather import fetch_weather_details
+
     report = fetch_weather_details(city)
 
     if "error" in report:
@@ -27,21 +27,54 @@ def get_weather_and_print(city: str):
 # main.py
 
 from gps_server import get_gps_location
-import json
 import os
-import requests
+
+# orjson when available, stdlib json otherwise (both accept bytes)
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 # Windows-safe temp file path
 file_path = r"C:\Users\admin\AppData\Local\Temp\gps_coords_temp.json"
 
+# Shared session so repeated reverse-geocodes reuse the same connection;
+# created on first use so startup doesn't import requests
+_SESSION = None
+
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        _SESSION = requests.Session()
+        _SESSION.headers["User-Agent"] = "PythonApp"
+    return _SESSION
+
 
 # ----------------------------
 # REVERSE GEOCODING FUNCTION
 # ----------------------------
 def get_city_from_coords(lat, lon):
     """
-    Finds city name from latitude and longitude using OpenStreetMap API.
+    Finds city name from latitude and longitude.
+    Uses the offline reverse_geocoder dataset when installed,
+    otherwise falls back to the OpenStreetMap (Nominatim) API.
     """
+    try:
+        # Imported lazily so startup doesn't pay for loading the dataset
+        import reverse_geocoder as rg
+    except ImportError:
+        rg = None
+
+    if rg is not None:
+        try:
+            result = rg.search((lat, lon), mode=1)
+            if result and result[0].get("name"):
+                return result[0]["name"]
+        except Exception as e:
+            print(f"Offline lookup failed, using OpenStreetMap: {e}")
+
     url = "https://nominatim.openstreetmap.org/reverse"
     params = {
         "lat": lat,
@@ -52,7 +85,7 @@ def get_city_from_coords(lat, lon):
     }
 
     try:
-        response = requests.get(url, params=params, headers={"User-Agent": "PythonApp"})
+        response = _get_session().get(url, params=params)
         data = response.json()
 
         city = (
@@ -83,8 +116,8 @@ def retrieve_coordinates_from_file(path):
         return None, None
 
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _loads(f.read())
 
         lat = data.get("latitude")
         lon = data.get("longitude")
@@ -139,10 +172,11 @@ if __name__ == "__main__":
             print(f"🗺 City: {city}")
 
         else:
+            city = None
             print("❌ Failed to retrieve new GPS location.")
 
         print("=" * 50)
 
-if __name__ == "__main__":
-    # Change your test city here
-    get_weather_and_print(city)
+    # 3) WEATHER FOR THE RESOLVED CITY
+    if city:
+        get_weather_and_print(city)
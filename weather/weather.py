@@ -1,19 +1,38 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import os
-import argparse
+import sys
+import time
+import tempfile
 import typing as t
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
 
+# orjson when available; the stdlib fallback is wrapped so _dumps still returns bytes
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
 
 BASE_URL = "https://api.openweathermap.org/data/2.5/"
+CURRENT_URL = f"{BASE_URL}weather"
+FORECAST_URL = f"{BASE_URL}forecast"
 DEFAULT_TIMEOUT = 6 
+CACHE_PATH = Path.home() / ".cache" / "weather.json"
+CACHE_TTL = 600  # seconds
+# Read once at import; an explicit api_key argument still takes precedence
+_API_KEY = os.environ.get("OPENWEATHER_API_KEY") or ""
 
-def _get_api_key(explicit_key: t.Optional[str] = None) -> t.Optional[str]:
-    """Return API key from explicit_key or environment variable."""
-    if explicit_key:
-        return explicit_key
-    return os.environ.get("OPENWEATHER_API_KEY")
+# Shared session so repeated calls reuse the pooled TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "weather-cli"
 
 
 def _format_value(value: t.Optional[float], fmt: str, fallback: str = "N/A") -> str:
@@ -26,41 +45,79 @@ def _format_value(value: t.Optional[float], fmt: str, fallback: str = "N/A") ->
         return fallback
 
 
-def fetch_weather_details(city: str,
-                          api_key: t.Optional[str] = None,
-                          timeout: int = DEFAULT_TIMEOUT) -> dict:
-    """
-    Fetch temperature, humidity, wind speed, and rain probability for a city.
+def _load_cache() -> dict:
+    """Return the on-disk report cache, or an empty dict if missing/corrupt."""
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            cache = _loads(f.read())
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
 
-    Returns:
-      - On success: dict with keys: city, temperature, humidity, wind_speed, rain_probability
-      - On failure: dict with key "error" and an explanatory message.
 
-    Behavior / notes:
-      - Uses 'metric' units for both current weather and forecast endpoints.
-      - Rain probability is computed as: the maximum 'pop' (probability of precipitation)
-        among forecast entries for the next ~24 hours (first 8 forecast items @ 3h interval).
-      - Safe against missing fields or partial API failures.
-    """
-    if not city or not isinstance(city, str):
-        return {"error": "Invalid city parameter."}
+def _is_fresh(entry: t.Any, now: float) -> bool:
+    """True if entry is a well-formed cache entry younger than CACHE_TTL (malformed -> expired)."""
+    if not isinstance(entry, dict) or "report" not in entry:
+        return False
+    ts = entry.get("ts")
+    if isinstance(ts, bool) or not isinstance(ts, (int, float)):
+        return False
+    # a timestamp in the future (clock moved back) is not trusted as fresh
+    return 0 <= now - ts < CACHE_TTL
 
-    key = _get_api_key('dc33ba7d8d00e9fb8038ff70fd673c97')
 
-    city = city.strip()
-    print(f"\n--- Looking up weather for {city.upper()} ---")
+def _cached_report(key: str, cache: t.Optional[dict] = None) -> t.Optional[dict]:
+    """Return the cached report for key if present and younger than CACHE_TTL."""
+    entry = (_load_cache() if cache is None else cache).get(key)
+    return entry["report"] if _is_fresh(entry, time.time()) else None
+
+
+def _store_cache(reports: t.Dict[str, dict]) -> None:
+    """Save reports by key; written to a temp file then renamed so readers never see a torn file."""
+    now = time.time()
+    # drop expired entries so the file doesn't grow without bound
+    cache = {k: v for k, v in _load_cache().items() if _is_fresh(v, now)}
+    cache.update({k: {"ts": now, "report": r} for k, r in reports.items()})
+    tmp_path = None
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # unique temp file per writer, so concurrent writers never share one
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_PATH.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps(cache))
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        # caching is best-effort
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-    current_url = f"{BASE_URL}weather"
-    forecast_url = f"{BASE_URL}forecast"
 
-    params_current = {"q": city, "appid": key, "units": "metric"}
-    params_forecast = {"q": city, "appid": key, "units": "metric"}
+def _to_pop(value: t.Any) -> t.Optional[float]:
+    """Normalize a forecast 'pop' value to 0..1 (missing -> 0, malformed -> None)."""
+    try:
+        p = float(value or 0.0)
+    except (TypeError, ValueError):
+        return None
+    # sometimes API returns percent by mistake — normalize, then clamp once
+    return min(1.0, max(0.0, p / 100.0 if p > 1 else p))
+
+
+def _submit_requests(ex: ThreadPoolExecutor, city: str, key: str,
+                     timeout: int) -> t.Tuple[Future, Future]:
+    """Submit the current-weather and forecast requests for city to ex."""
+    # Both endpoints take identical query parameters
+    params = {"q": city, "appid": key, "units": "metric"}
+    return (ex.submit(_SESSION.get, CURRENT_URL, params=params, timeout=timeout),
+            ex.submit(_SESSION.get, FORECAST_URL, params=params, timeout=timeout))
 
+
+def _build_report(city: str, f_curr: Future, f_fc: Future) -> dict:
+    """Turn the two API responses for city into a report (or an error dict)."""
     current_data: t.Optional[dict] = None
     forecast_data: t.Optional[dict] = None
 
     try:
-        resp_curr = requests.get(current_url, params=params_current, timeout=timeout)
+        resp_curr = f_curr.result()
         if resp_curr.status_code == 404:
             return {"error": f"City '{city}' not found (404)."}
         resp_curr.raise_for_status()
@@ -75,7 +132,7 @@ def fetch_weather_details(city: str,
 
     # Forecast is secondary; if it fails we'll still return current data with rain_probability = "N/A"
     try:
-        resp_fc = requests.get(forecast_url, params=params_forecast, timeout=timeout)
+        resp_fc = f_fc.result()
         resp_fc.raise_for_status()
         forecast_data = resp_fc.json()
     except requests.exceptions.RequestException:
@@ -96,34 +153,11 @@ def fetch_weather_details(city: str,
         # consider up to first 8 entries (~24 hours with 3h forecast intervals)
         if isinstance(flist, list) and len(flist) > 0:
             consider = flist[:8]  # safe slice even if less than 8 entries
-            pops = []
-            for entry in consider:
-                if not isinstance(entry, dict):
-                    continue
-                # 'pop' might be missing; default to 0
-                p = entry.get("pop")
-                try:
-                    if p is None:
-                        p = 0.0
-                    # ensure numeric
-                    p = float(p)
-                    if p < 0:
-                        p = 0.0
-                    if p > 1:
-                        # sometimes API returns percent by mistake — normalize
-                        if p > 1 and p <= 100:
-                            p = p / 100.0
-                        else:
-                            p = max(0.0, min(1.0, p))
-                    pops.append(p)
-                except Exception:
-                    # ignore malformed pop values
-                    continue
-            if pops:
-                max_pop = max(pops)
+            pops = [p for p in (_to_pop(e.get("pop")) for e in consider if isinstance(e, dict))
+                    if p is not None]
+            max_pop = max(pops, default=None)
+            if max_pop is not None:
                 rain_probability = f"{max_pop * 100:.0f}%"
-            else:
-                rain_probability = "N/A"
 
     # Prepare formatted report
     report = {
@@ -137,6 +171,108 @@ def fetch_weather_details(city: str,
     return report
 
 
+def fetch_weather_details(city: str,
+                          api_key: t.Optional[str] = None,
+                          timeout: int = DEFAULT_TIMEOUT) -> dict:
+    """
+    Fetch temperature, humidity, wind speed, and rain probability for a city.
+
+    Returns:
+      - On success: dict with keys: city, temperature, humidity, wind_speed, rain_probability
+      - On failure: dict with key "error" and an explanatory message.
+
+    Behavior / notes:
+      - Uses 'metric' units for both current weather and forecast endpoints.
+      - Rain probability is computed as: the maximum 'pop' (probability of precipitation)
+        among forecast entries for the next ~24 hours (first 8 forecast items @ 3h interval).
+      - Safe against missing fields or partial API failures.
+      - Successful reports are cached on disk (CACHE_PATH) for CACHE_TTL seconds per city.
+    """
+    if not city or not isinstance(city, str):
+        return {"error": "Invalid city parameter."}
+
+    key = api_key or _API_KEY
+    if not key:
+        return {"error": "No API key: pass api_key or set OPENWEATHER_API_KEY."}
+
+    city = city.strip()
+    print(f"\n--- Looking up weather for {city.upper()} ---")
+
+    cache_key = city.lower()
+    cached = _cached_report(cache_key)
+    if cached is not None:
+        return cached
+
+    # The two endpoints are independent; fetch them concurrently
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_curr, f_fc = _submit_requests(ex, city, key, timeout)
+
+    report = _build_report(city, f_curr, f_fc)
+    if "error" not in report:
+        _store_cache({cache_key: report})
+    return report
+
+
+def fetch_weather_details_many(cities: t.List[str],
+                               api_key: t.Optional[str] = None,
+                               timeout: int = DEFAULT_TIMEOUT,
+                               max_workers: int = 8) -> t.Dict[str, dict]:
+    """
+    Fetch weather reports for several cities at once.
+
+    All requests run concurrently on one thread pool and share the module session,
+    so connections to the API host are reused across cities. Inputs that differ only
+    in case or surrounding whitespace are fetched once.
+
+    Returns a dict mapping each city as given to the same report / error dict
+    that fetch_weather_details() would return for it.
+    Raises TypeError if any entry is not a string.
+    """
+    bad = [c for c in cities if not isinstance(c, str)]
+    if bad:
+        raise TypeError(f"cities must be strings, got {bad!r}")
+
+    key = api_key or _API_KEY
+    if not key:
+        return {c: {"error": "No API key: pass api_key or set OPENWEATHER_API_KEY."} for c in cities}
+
+    cache = _load_cache()
+    results: t.Dict[str, dict] = {}
+    # cache key -> (stripped name, every input string that maps to it)
+    groups: t.Dict[str, t.Tuple[str, t.List[str]]] = {}
+    for c in cities:
+        if not c:
+            results[c] = {"error": "Invalid city parameter."}
+            continue
+        name = c.strip()
+        results[c] = {}  # placeholder keeps input order
+        groups.setdefault(name.lower(), (name, []))[1].append(c)
+
+    fresh: t.Dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = {}
+        for cache_key, (name, inputs) in groups.items():
+            print(f"\n--- Looking up weather for {name.upper()} ---")
+            cached = _cached_report(cache_key, cache)
+            if cached is not None:
+                for c in inputs:
+                    results[c] = cached
+            else:
+                futures[cache_key] = _submit_requests(ex, name, key, timeout)
+
+        for cache_key, (f_curr, f_fc) in futures.items():
+            name, inputs = groups[cache_key]
+            report = _build_report(name, f_curr, f_fc)
+            for c in inputs:
+                results[c] = report
+            if "error" not in report:
+                fresh[cache_key] = report
+
+    if fresh:
+        _store_cache(fresh)
+    return results
+
+
 def _print_report(report: dict) -> None:
     """Nicely print the report (handles error messages too)."""
     if report is None:
@@ -153,13 +289,54 @@ def _print_report(report: dict) -> None:
     print(f"Rain probability (next ~24h): {report.get('rain_probability')}")
 
 
+_USAGE = "usage: weather.py [-h] --city CITY [--api-key API_KEY]\n"
+_HELP = _USAGE + """
+Get current weather + rain probability (OpenWeatherMap).
+
+options:
+  -h, --help            show this help message and exit
+  --city CITY, -c CITY  City name (e.g., 'London,UK' or 'Mumbai')
+  --api-key API_KEY     OpenWeatherMap API key (optional; overrides env var).
+"""
+
+
+def _arg_error(message: str) -> t.NoReturn:
+    """Print usage and an error to stderr and exit with status 2 (as argparse does)."""
+    sys.stderr.write(f"{_USAGE}weather.py: error: {message}\n")
+    sys.exit(2)
+
+
+def _parse_args(argv: t.List[str]) -> t.Dict[str, t.Optional[str]]:
+    """Minimal argv parser (argparse costs more to import than this CLI needs)."""
+    opts: t.Dict[str, t.Optional[str]] = {"city": None, "api_key": None}
+    flags = {"--city": "city", "-c": "city", "--api-key": "api_key"}
+    it = iter(argv)
+    for arg in it:
+        if arg in ("-h", "--help"):
+            print(_HELP, end="")
+            sys.exit(0)
+        if arg.startswith("-c") and len(arg) > 2 and arg[2] != "=":
+            # short option with the value attached, e.g. -cParis
+            opts["city"] = arg[2:]
+            continue
+        name, sep, value = arg.partition("=")
+        if name not in flags:
+            _arg_error(f"unrecognized argument: {arg}")
+        if not sep:
+            value = next(it, None)
+            # like argparse, a following option is not taken as this flag's value
+            if value is None or value.startswith("-"):
+                _arg_error(f"argument {name}: expected one argument")
+        opts[flags[name]] = value
+    if not opts["city"]:
+        _arg_error("the following arguments are required: --city/-c")
+    return opts
+
+
 def _cli_main():
-    parser = argparse.ArgumentParser(description="Get current weather + rain probability (OpenWeatherMap).")
-    parser.add_argument("--city", "-c", required=True, help="City name (e.g., 'London,UK' or 'Mumbai')")
-    parser.add_argument("--api-key", help="OpenWeatherMap API key (optional; overrides env var).")
-    args = parser.parse_args()
+    args = _parse_args(sys.argv[1:])
 
-    report = fetch_weather_details(args.city, api_key=args.api_key)
+    report = fetch_weather_details(args["city"], api_key=args["api_key"])
     _print_report(report)
 
 